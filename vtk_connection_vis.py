@@ -1,42 +1,455 @@
+import functools
+import mmap
+import os
+import zipfile
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
 import vtk
+from vtk.util.numpy_support import get_numpy_array_type, numpy_to_vtk, numpy_to_vtkIdTypeArray
 
-def get_positions() -> vtk.vtkPoints:
+# Numba is optional, without it the connection files are parsed with pandas
+try:
+    from numba import get_num_threads, njit, prange, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Connection files larger than this many bytes are parsed in parallel
+PARALLEL_PARSE_SIZE = 10 * 1024 ** 2
+
+# Numpy dtype of vtkIdType, which is 32 or 64 bit depending on the VTK build
+ID_DTYPE = np.dtype(get_numpy_array_type(vtk.VTK_ID_TYPE))
+
+# Version of the layout of the cached arrays, increase it when the parsers change
+CACHE_VERSION = 2
+
+# Arrays loaded during this session, by cache file location
+_LOADED = {}
+
+class Adjacency(NamedTuple):
+    """Compressed sparse row adjacency of the connections.
+
+    The neurons connected to neuron i are indices[offsets[i]:offsets[i + 1]],
+    with n_src the number of neurons in the position file. When every neuron
+    connects to every other neuron the adjacency is marked as complete and no
+    offsets and indices are stored.
+    """
+    offsets: Optional[np.ndarray]
+    indices: Optional[np.ndarray]
+    n_src: int
+    complete: bool = False
+
+    def neighbors(self, neuron_id: int) -> np.ndarray:
+        """Get the neurons a neuron is connected to.
+
+        Args:
+            neuron_id (int): zero based neuron id
+
+        Returns:
+            np.ndarray: zero based ids of the connected neurons, empty if it has no connections
+
+        Raises:
+            IndexError: if the neuron id is not between 0 and the number of neurons
+        """
+        # Negative ids would silently index from the end
+        if not 0 <= neuron_id < self.n_src:
+            raise IndexError(f'neuron id {neuron_id} is out of range for {self.n_src} neurons')
+
+        if self.complete:
+            return np.delete(np.arange(self.n_src), neuron_id)
+
+        return self.indices[self.offsets[neuron_id]:self.offsets[neuron_id + 1]]
+
+def load_cached(file_loc: str,
+                cache_name: str,
+                parse: Callable[[str], Dict[str, np.ndarray]],
+                dependency_locs: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """Load parsed arrays from a cache file next to the input file.
+
+    The cache is stored as a .npz file and is only reused while the size and
+    modification time of the input file and its dependencies and the cache
+    version match the ones it was created with. Arrays that were already
+    loaded during this session are returned without reading the cache file again.
+
+    Args:
+        file_loc (str): input file location
+        cache_name (str): name to tell caches of the same input file apart
+        parse (Callable): parser returning a dictionary of named arrays
+        dependency_locs (Sequence[str]): other files the parsed arrays depend on
+
+    Returns:
+        dict: parsed arrays by name
+    """
+    # Get the cache file location and the state of the input file and its dependencies
+    cache_file_loc = f'{os.path.splitext(file_loc)[0]}.{cache_name}.npz'
+    source = [CACHE_VERSION]
+    for loc in (file_loc, *dependency_locs):
+        file_stat = os.stat(loc)
+        source += [file_stat.st_size, file_stat.st_mtime_ns]
+    source = np.array(source, dtype=np.int64)
+
+    # Reuse the arrays loaded earlier in this session if the input file is unchanged
+    if cache_file_loc in _LOADED:
+        loaded_source, arrays = _LOADED[cache_file_loc]
+        if np.array_equal(loaded_source, source):
+            return arrays
+
+    # Reuse the cache if it was created from the current input file, a damaged cache is reparsed
+    arrays = None
+    if os.path.exists(cache_file_loc):
+        try:
+            with np.load(cache_file_loc) as cache:
+                if np.array_equal(cache['source'], source):
+                    arrays = {name: cache[name] for name in cache.files if name != 'source'}
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            arrays = None
+
+    # Parse the input file and store the result for the next run
+    if arrays is None:
+        arrays = parse(file_loc)
+        save_cache(cache_file_loc, source, arrays)
+
+    _LOADED[cache_file_loc] = (source, arrays)
+
+    return arrays
+
+def save_cache(cache_file_loc: str, source: np.ndarray, arrays: Dict[str, np.ndarray]) -> None:
+    """Save parsed arrays to a cache file.
+
+    The arrays are written to a temporary file that replaces the cache file
+    once it is complete, so an interrupted run cannot leave a truncated cache.
+    If the cache cannot be written, for example in a read-only directory,
+    caching is skipped.
+
+    Args:
+        cache_file_loc (str): cache file location
+        source (np.ndarray): state of the input file the arrays were parsed from
+        arrays (dict): parsed arrays by name
+    """
+    # Write the arrays next to the cache file and move them into place
+    temp_file_loc = f'{cache_file_loc}.{os.getpid()}.tmp'
+    try:
+        with open(temp_file_loc, 'wb') as temp_file:
+            np.savez(temp_file, source=source, **arrays)
+        os.replace(temp_file_loc, cache_file_loc)
+    except OSError:
+        # Remove what was written of the temporary file
+        if os.path.exists(temp_file_loc):
+            os.remove(temp_file_loc)
+
+def parse_positions(position_file_loc: str) -> Dict[str, np.ndarray]:
+    """Parse the position coordinates and area numbers from the position file.
+
+    Args:
+        position_file_loc (str): position file location
+
+    Returns:
+        dict: (N, 3) position array under 'positions', area array under 'areas'
+    """
+    # Parse the coordinate and area columns in a single pass
+    position_file = pd.read_csv(position_file_loc, comment='#', sep=r'\s+', header=None,
+                                usecols=[1, 2, 3, 4], engine='c', memory_map=True)
+
+    # Extract the position coordinates and the area numbers
+    positions = position_file[[1, 2, 3]].to_numpy(dtype=np.float32)
+    areas = position_file[4].str.removeprefix('area_').astype(np.int16).to_numpy()
+
+    return {'positions': np.ascontiguousarray(positions), 'areas': areas}
+
+def count_lines(buffer: np.ndarray, start: int, stop: int) -> int:
+    """Bound the number of lines in a part of the raw bytes of a connection file.
+
+    Args:
+        buffer (np.ndarray): uint8 array with the contents of the connection file
+        start (int): position of the first byte
+        stop (int): position after the last byte
+
+    Returns:
+        int: upper bound on the number of lines, the number of newlines plus one,
+             so a part that ends with a newline is over-counted by one
+    """
+    n_lines = 1
+    for i in range(start, stop):
+        if buffer[i] == 10:
+            n_lines += 1
+
+    return n_lines
+
+def parse_edge_lines(buffer: np.ndarray,
+                     start: int,
+                     stop: int,
+                     src: np.ndarray,
+                     dst: np.ndarray,
+                     first: int) -> int:
+    """Parse the source and destination ids of the lines in a part of a connection file.
+
+    Lines starting with # and empty lines are skipped, the ids are read from
+    the second and fourth whitespace separated field of every other line.
+
+    Args:
+        buffer (np.ndarray): uint8 array with the contents of the connection file
+        start (int): position of the first byte, at the start of a line
+        stop (int): position after the last byte, at the start of a line or the end of the buffer
+        src (np.ndarray): array to write the zero based source ids to
+        dst (np.ndarray): array to write the zero based destination ids to
+        first (int): position in src and dst to write the first edge to
+
+    Returns:
+        int: number of parsed edges
+    """
+    n_edges = 0
+    i = start
+    while i < stop:
+        # Skip lines starting with #
+        if buffer[i] == 35:
+            while i < stop and buffer[i] != 10:
+                i += 1
+            i += 1
+            continue
+
+        # Walk over the fields of the line and accumulate the digits of each field
+        field = 0
+        value = 0
+        in_field = False
+        while i <= stop:
+            byte = buffer[i] if i < stop else 10
+            if byte == 10 or byte == 32 or byte == 9 or byte == 13:
+                # Store the value when the second or fourth field ends
+                if in_field:
+                    if field == 1:
+                        src[first + n_edges] = value - 1
+                    elif field == 3:
+                        dst[first + n_edges] = value - 1
+                    field += 1
+                    in_field = False
+                if byte == 10:
+                    break
+            else:
+                if not in_field:
+                    in_field = True
+                    value = 0
+                value = value * 10 + (int(byte) - 48)
+            i += 1
+        i += 1
+
+        # Keep the edge if the line had both ids
+        if field > 3:
+            n_edges += 1
+
+    return n_edges
+
+def parse_edges(buffer: np.ndarray) -> (np.ndarray, np.ndarray):
+    """Parse the source and destination ids from the raw bytes of a connection file.
+
+    Args:
+        buffer (np.ndarray): uint8 array with the contents of the connection file
+
+    Returns:
+        np.ndarray: zero based source ids
+        np.ndarray: zero based destination ids
+    """
+    # Every edge takes up a line, so the number of lines bounds the number of edges
+    n_lines = count_lines(buffer, 0, len(buffer))
+    src = np.empty(n_lines, dtype=np.int32)
+    dst = np.empty(n_lines, dtype=np.int32)
+
+    n_edges = parse_edge_lines(buffer, 0, len(buffer), src, dst, 0)
+
+    return src[:n_edges], dst[:n_edges]
+
+def parse_edges_parallel(buffer: np.ndarray, n_chunks: int) -> (np.ndarray, np.ndarray):
+    """Parse the source and destination ids from the raw bytes of a connection file in parallel.
+
+    The buffer is split into chunks of whole lines which are parsed
+    concurrently, the edges keep the order in which they appear in the file.
+
+    Args:
+        buffer (np.ndarray): uint8 array with the contents of the connection file
+        n_chunks (int): number of chunks to split the buffer into
+
+    Returns:
+        np.ndarray: zero based source ids
+        np.ndarray: zero based destination ids
+    """
+    # Split the buffer into roughly equal chunks that start at the beginning of a line
+    bounds = np.empty(n_chunks + 1, dtype=np.int64)
+    bounds[0] = 0
+    for k in range(1, n_chunks):
+        i = max(len(buffer) * k // n_chunks, bounds[k - 1])
+        while 0 < i < len(buffer) and buffer[i - 1] != 10:
+            i += 1
+        bounds[k] = i
+    bounds[n_chunks] = len(buffer)
+
+    # Give every chunk room for as many edges as it has lines
+    first = np.zeros(n_chunks + 1, dtype=np.int64)
+    for k in prange(n_chunks):
+        first[k + 1] = count_lines(buffer, bounds[k], bounds[k + 1])
+    first = np.cumsum(first)
+    src = np.empty(first[n_chunks], dtype=np.int32)
+    dst = np.empty(first[n_chunks], dtype=np.int32)
+
+    # Parse the chunks concurrently
+    n_chunk_edges = np.empty(n_chunks, dtype=np.int64)
+    for k in prange(n_chunks):
+        n_chunk_edges[k] = parse_edge_lines(buffer, bounds[k], bounds[k + 1], src, dst, first[k])
+
+    # Move the edges of the chunks next to each other
+    n_edges = 0
+    for k in range(n_chunks):
+        for i in range(first[k], first[k] + n_chunk_edges[k]):
+            src[n_edges] = src[i]
+            dst[n_edges] = dst[i]
+            n_edges += 1
+
+    return src[:n_edges], dst[:n_edges]
+
+if NUMBA_AVAILABLE:
+    # Compile eagerly for read-only byte buffers, so the cached build is reused every run
+    buffer_type = types.Array(types.uint8, 1, 'C', readonly=True)
+    count_lines = njit(cache=True)(count_lines)
+    parse_edge_lines = njit(cache=True)(parse_edge_lines)
+    parse_edges = njit(types.UniTuple(types.int32[:], 2)(buffer_type), cache=True)(parse_edges)
+    parse_edges_parallel = njit(types.UniTuple(types.int32[:], 2)(buffer_type, types.int64),
+                                parallel=True, cache=True)(parse_edges_parallel)
+
+def build_adjacency(src: np.ndarray, dst: np.ndarray, n_neurons: int) -> Adjacency:
+    """Build the compressed sparse row adjacency of a list of connections.
+
+    Args:
+        src (np.ndarray): zero based source ids
+        dst (np.ndarray): zero based destination ids
+        n_neurons (int): number of neurons
+
+    Returns:
+        Adjacency: adjacency of the connections
+    """
+    # Group the destination ids by source id
+    order = np.argsort(src, kind='stable')
+    indices = dst[order]
+
+    # Count the connections per source id to get the row offsets
+    offsets = np.zeros(n_neurons + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_neurons), out=offsets[1:])
+
+    return Adjacency(offsets, indices, n_neurons)
+
+def is_complete_graph(src: np.ndarray, dst: np.ndarray, n_neurons: int) -> bool:
+    """Check whether every neuron is connected exactly once to every other neuron.
+
+    Args:
+        src (np.ndarray): zero based source ids
+        dst (np.ndarray): zero based destination ids
+        n_neurons (int): number of neurons
+
+    Returns:
+        bool: True if the connections form a complete graph
+    """
+    # Only an edge list of exactly N * (N - 1) edges can be complete
+    if n_neurons < 2 or len(src) != n_neurons * (n_neurons - 1):
+        return False
+
+    # Without self connections and duplicates, that many edges cover every pair
+    if np.any(src == dst):
+        return False
+    pairs = src.astype(np.int64) * n_neurons + dst
+
+    return len(np.unique(pairs)) == len(pairs)
+
+def parse_connections(connection_infile_loc: str, n_neurons: int) -> Dict[str, np.ndarray]:
+    """Parse the connection file into a compressed sparse row adjacency.
+
+    Args:
+        connection_infile_loc (str): connection file location
+        n_neurons (int): number of neurons in the position file
+
+    Returns:
+        dict: number of neurons under 'n_neurons' and the CSR arrays under
+              'offsets' and 'indices', which are left out if the connections
+              form a complete graph
+    """
+    # Parse the source and destination ids in bulk, an empty file cannot be memory mapped
+    if os.path.getsize(connection_infile_loc) == 0:
+        src = np.empty(0, dtype=np.int32)
+        dst = np.empty(0, dtype=np.int32)
+    elif NUMBA_AVAILABLE:
+        # Let the parser read straight from a memory map of the file
+        with open(connection_infile_loc, 'rb') as connection_infile, \
+                mmap.mmap(connection_infile.fileno(), 0, access=mmap.ACCESS_READ) as connection_map:
+            buffer = np.frombuffer(connection_map, dtype=np.uint8)
+            if len(buffer) > PARALLEL_PARSE_SIZE:
+                src, dst = parse_edges_parallel(buffer, get_num_threads())
+            else:
+                src, dst = parse_edges(buffer)
+            # Release the view so the memory map can be closed
+            del buffer
+    else:
+        try:
+            edges = pd.read_csv(connection_infile_loc, comment='#', sep=r'\s+', header=None,
+                                usecols=[1, 3], dtype=np.int32, engine='c',
+                                memory_map=True).to_numpy() - 1
+        except pd.errors.EmptyDataError:
+            # A file with only header lines holds no connections
+            edges = np.empty((0, 2), dtype=np.int32)
+        src, dst = edges[:, 0], edges[:, 1]
+
+    # Every connection has to be between neurons of the position file
+    if len(src) and (min(src.min(), dst.min()) < 0 or max(src.max(), dst.max()) >= n_neurons):
+        raise ValueError(f'{connection_infile_loc} has neuron ids outside of 1 to {n_neurons}')
+
+    # A complete graph is fully described by its number of neurons
+    if is_complete_graph(src, dst, n_neurons):
+        return {'n_neurons': np.array(n_neurons)}
+
+    # Build the adjacency over every neuron of the position file
+    adjacency = build_adjacency(src, dst, n_neurons)
+
+    return {'n_neurons': np.array(n_neurons), 'offsets': adjacency.offsets, 'indices': adjacency.indices}
+
+def load_positions_file(position_file_loc: str) -> (np.ndarray, np.ndarray):
+    """Load the position coordinates and area numbers of the position file.
+
+    Args:
+        position_file_loc (str): position file location
+
+    Returns:
+        np.ndarray: (N, 3) position coordinates
+        np.ndarray: area numbers
+    """
+    position_data = load_cached(position_file_loc, 'positions', parse_positions)
+
+    return position_data['positions'], position_data['areas']
+
+@functools.lru_cache(maxsize=4)
+def get_positions(simulation_type: str) -> vtk.vtkPoints:
     """Read the position file.
 
+    Args:
+        simulation_type (str): simulation type
+
     Returns:
         vtk.vtkPoints: position points
     """
     # Get the position file location
     position_file_loc = f'data/viz-{simulation_type}/positions/rank_0_positions.txt'
 
-    # Create an empty vtkPoints object
+    # Load the position coordinates
+    positions, _ = load_positions_file(position_file_loc)
+
+    # Wrap the positions array without copying and hand it to a vtkPoints object
     points = vtk.vtkPoints()
+    points.SetData(numpy_to_vtk(positions, deep=False, array_type=vtk.VTK_FLOAT))
 
-    # Open the position file
-    with open(position_file_loc, 'r') as position_file:
-        # Read the lines of the file
-        lines = position_file.readlines()
-        
-        # Iterate over the lines
-        for line in lines:
-            # Skip lines starting with #
-            if line.startswith('#'):
-                continue
-            
-            # Split the line into fields
-            fields = line.strip().split()
-            
-            # Extract the position coordinates
-            x, y, z = map(float, fields[1:4])
-            
-            # Add the point to the vtkPoints object
-            points.InsertNextPoint(x, y, z)
-        
-        # Print the vtkPoints object
     return points
 
-def get_areas_list() -> list:
+def get_areas_list(simulation_type: str) -> list:
     """Read the area file.
+
+    Args:
+        simulation_type (str): simulation type
     
     Returns:
         list: area list
@@ -44,133 +457,110 @@ def get_areas_list() -> list:
     # Get the area file location
     area_file_loc = f'data/viz-{simulation_type}/positions/rank_0_positions.txt'
 
-    # Open the area file
-    with open(area_file_loc, 'r') as area_file:
-        # Read the lines of the file
-        lines = area_file.readlines()
-        
-        # Create an empty list
-        areas = []
-        
-        # Iterate over the lines
-        for line in lines:
-            # Skip lines starting with #
-            if line.startswith('#'):
-                continue
-            
-            # Split the line into fields
-            fields = line.strip().split()
-            
-            # Extract the area
-            area = int(fields[4].split('_')[1])
-            
-            # Add the area to the list
-            areas.append(area)
-        
+    # Load the area numbers
+    _, areas = load_positions_file(area_file_loc)
+
     # Return the area list
-    return areas
+    return areas.tolist()
 
-def get_areas() -> vtk.vtkIntArray:
+@functools.lru_cache(maxsize=4)
+def get_areas(simulation_type: str) -> vtk.vtkShortArray:
     """Get the brain areas.
 
+    Args:
+        simulation_type (str): simulation type
+
     Returns:
-        vtk.vtkIntArray: brain areas
+        vtk.vtkShortArray: brain areas
     """
-    # Create an empty vtkIntArray object for the brain areas
-    areas_array = vtk.vtkIntArray()
-    areas_array.SetNumberOfComponents(1)
-    areas_array.SetName('Areas')
+    # Get the area file location
+    area_file_loc = f'data/viz-{simulation_type}/positions/rank_0_positions.txt'
 
-    # Get the brain areas list and add values to the vtkIntArray object
-    areas = get_areas_list()
-    for area in areas:
-        areas_array.InsertNextValue(area)
+    # Load the area numbers
+    _, areas = load_positions_file(area_file_loc)
+
+    # Wrap the areas array in a vtkShortArray object
+    areas_array = numpy_to_vtk(areas, deep=False, array_type=vtk.VTK_SHORT)
+    areas_array.SetName('Areas')
 
     return areas_array
 
-def get_connections_dict(step: int = 1000000) -> dict:
-    """Read the connection file.
+def get_adjacency(simulation_type: str, step: int = 1000000) -> Adjacency:
+    """Read the connection file into a compressed sparse row adjacency.
 
     Args:
+        simulation_type (str): simulation type
         step (int): simulation step
 
     Returns:
-        dict: connection dictionary
+        Adjacency: adjacency of the connections
     """
-    # Get the connection file location
+    # Get the connection and position file locations
     connection_infile_loc = f'data/viz-{simulation_type}/network/rank_0_step_{step}_out_network.txt'
+    position_file_loc = f'data/viz-{simulation_type}/positions/rank_0_positions.txt'
 
-    # Create an empty dictionary
-    connections_dict = {}
-
-    # Open the connection file
-    with open(connection_infile_loc, 'r') as connection_infile:
-        # Read the lines of the file
-        lines = connection_infile.readlines()
-        
-        # Iterate over the lines
-        for line in lines:
-            # Skip empty lines
-            if not line or not line.strip():
-                continue
-            
-            # Skip lines starting with #
-            if line.startswith('#'):
-                continue
-            
-            # Split the line into fields
-            fields = line.strip().split()
-            
-            # Extract the values
-            id1 = int(fields[1]) - 1
-            id2 = int(fields[3]) - 1
-            
-            # Add the connection to the dictionary
-            if id1 not in connections_dict:
-                connections_dict[id1] = []
-            connections_dict[id1].append(id2)
-    
-    return connections_dict
+    # Size the adjacency by the number of neurons in the position file
+    positions, _ = load_positions_file(position_file_loc)
+    parse = functools.partial(parse_connections, n_neurons=len(positions))
 
-def get_connections(step: int = 1000000) -> vtk.vtkCellArray:
+    # Load the adjacency arrays, they depend on the position file through its number of neurons
+    adjacency = load_cached(connection_infile_loc, 'csr', parse, [position_file_loc])
+    n_neurons = int(adjacency['n_neurons'])
+    if 'offsets' not in adjacency:
+        return Adjacency(None, None, n_neurons, complete=True)
+
+    return Adjacency(adjacency['offsets'], adjacency['indices'], n_neurons)
+
+@functools.lru_cache(maxsize=4)
+def get_connections(simulation_type: str, step: int = 1000000) -> vtk.vtkCellArray:
     """Get the connections.
 
     Args:
+        simulation_type (str): simulation type
         step (int): simulation step
 
     Returns:
         vtk.vtkCellArray: connections
     """
-    # Get the connections dictionary
-    connections_dict = get_connections_dict(step)
-
-    # Create an empty vtkCellArray object to store the connections
+    # Get the connections adjacency
+    adjacency = get_adjacency(simulation_type, step)
+
+    # Expand the adjacency into source and destination ids
+    n_neurons = adjacency.n_src
+    if adjacency.complete:
+        # Connect every neuron to every other neuron
+        src = np.repeat(np.arange(n_neurons, dtype=ID_DTYPE), n_neurons - 1)
+        dst = np.broadcast_to(np.arange(n_neurons, dtype=ID_DTYPE),
+                              (n_neurons, n_neurons))[~np.eye(n_neurons, dtype=bool)]
+    else:
+        src = np.repeat(np.arange(n_neurons, dtype=ID_DTYPE), np.diff(adjacency.offsets))
+        dst = adjacency.indices
+    n_connections = len(src)
+
+    # Interleave source and destination ids into two-point cells
+    connectivity = np.empty(2 * n_connections, dtype=ID_DTYPE)
+    connectivity[0::2] = src
+    connectivity[1::2] = dst
+    cell_offsets = np.arange(0, 2 * n_connections + 1, 2, dtype=ID_DTYPE)
+
+    # Hand both arrays to a vtkCellArray object in one call
     connections = vtk.vtkCellArray()
+    connections.SetData(numpy_to_vtkIdTypeArray(cell_offsets, deep=False),
+                        numpy_to_vtkIdTypeArray(connectivity, deep=False))
 
-    # Iterate over the connections dictionary to get connected ids
-    for id1, id2s in connections_dict.items():
-        for id2 in id2s:
-            # Create a vtkPolyLine object to store the connection
-            polyline = vtk.vtkPolyLine()
-            polyline.GetPointIds().SetNumberOfIds(2)
-
-            # Add the ids to the vtkPolyLine object
-            polyline.GetPointIds().SetId(0, id1)
-            polyline.GetPointIds().SetId(1, id2)
-            
-            # Add the vtkPolyLine object to the vtkCellArray object
-            connections.InsertNextCell(polyline)
-            
     return connections
 
 def create_polydata(points: vtk.vtkPoints,
                     connections: vtk.vtkCellArray,
-                    area_mapping: bool) -> (vtk.vtkPolyData, vtk.vtkPolyData):
+                    area_mapping: bool,
+                    simulation_type: str) -> (vtk.vtkPolyData, vtk.vtkPolyData):
     """Create polydata for points and connections.
 
     Args:
         points (vtk.vtkPoints): points
         connections (vtk.vtkCellArray): connections
+        area_mapping (bool): display neuron color based on area
+        simulation_type (str): simulation type
     
     Returns:
         vtk.vtkPolyData: points polydata
@@ -183,10 +573,17 @@ def create_polydata(points: vtk.vtkPoints,
     # Set the points and connections for both vtkPolyData objects
     points_polydata.SetPoints(points)
     lines_polydata.SetPoints(points)
+
+    # Add a vertex cell for every point so the points can be rendered without a glyph filter
+    n_points = points.GetNumberOfPoints()
+    vertices = vtk.vtkCellArray()
+    vertices.SetData(numpy_to_vtkIdTypeArray(np.arange(n_points + 1, dtype=ID_DTYPE), deep=False),
+                     numpy_to_vtkIdTypeArray(np.arange(n_points, dtype=ID_DTYPE), deep=False))
+    points_polydata.SetVerts(vertices)
     
     # Get area mapping
     if area_mapping:
-        areas = get_areas()
+        areas = get_areas(simulation_type)
         points_polydata.GetPointData().SetScalars(areas)
 
     # Set the lines for the connections vtkPolyData object
@@ -194,27 +591,11 @@ def create_polydata(points: vtk.vtkPoints,
 
     return points_polydata, lines_polydata
 
-def create_glyph_filter(polydata: vtk.vtkPolyData) -> vtk.vtkGlyph3D:
-    """Create a glyph filter to display all the points.
-
-    Args:
-        polydata (vtk.vtkPolyData): polydata
-    
-    Returns:
-        vtk.vtkGlyph3D: glyph filter
-    """
-    # Create a sphere source and a glyph filter to represent and display the points
-    glyph_filter = vtk.vtkVertexGlyphFilter()
-    glyph_filter.SetInputData(polydata)
-    glyph_filter.Update()
-
-    return glyph_filter
-
-def create_point_actor(glyph_filter: vtk.vtkGlyph3D, area_mapping: bool) -> vtk.vtkActor:
+def create_point_actor(polydata: vtk.vtkPolyData, area_mapping: bool) -> vtk.vtkActor:
     """Create an actor for the points.
 
     Args:
-        glyph_filter (vtk.vtkGlyph3D): glyph filter
+        polydata (vtk.vtkPolyData): points polydata
         area_mapping (bool): display neuron color based on area
 
     Returns:
@@ -222,7 +603,7 @@ def create_point_actor(glyph_filter: vtk.vtkGlyph3D, area_mapping: bool) -> vtk.
     """
     # Create a mapper 
     point_mapper = vtk.vtkPolyDataMapper()
-    point_mapper.SetInputConnection(glyph_filter.GetOutputPort())
+    point_mapper.SetInputData(polydata)
 
     # Appearance settings for the points
     if area_mapping:
@@ -262,8 +643,9 @@ def create_connection_actor(polydata: vtk.vtkPolyData) -> vtk.vtkActor:
 
     return connection_actor
 
+@functools.lru_cache(maxsize=1)
 def get_lut() -> vtk.vtkLookupTable:
-    """Get the lookup table for colors.
+    """Get the lookup table for colors, shared by every mapper.
 
     Returns:
         vtk.vtkLookupTable: lookup table
@@ -281,6 +663,7 @@ def get_lut() -> vtk.vtkLookupTable:
 def plot(positions: vtk.vtkPoints,
          connections: vtk.vtkCellArray,
          area_mapping: bool,
+         simulation_type: str,
          ) -> None:
     """Plot the points and connections.
 
@@ -288,17 +671,15 @@ def plot(positions: vtk.vtkPoints,
         positions (vtk.vtkPoints): position points
         connections (vtk.vtkCellArray): connections
         area_mapping (bool): display neuron color based on area
+        simulation_type (str): simulation type
     
     Returns:
         None
     """
     # Create polydata for points and connections
-    points, lines = create_polydata(positions, connections, area_mapping)
-    # Create a glyph filter to display all the points
-    glyph_filter = create_glyph_filter(points)
-
+    points, lines = create_polydata(positions, connections, area_mapping, simulation_type)
     # Create actors for points and connections
-    point_actor = create_point_actor(glyph_filter, area_mapping)
+    point_actor = create_point_actor(points, area_mapping)
     connection_actor = create_connection_actor(lines)
 
     # Add axes reference
@@ -345,17 +726,17 @@ def plot(positions: vtk.vtkPoints,
 
 def main():
     # Choose the simulation type
-    global simulation_type
     simulation_type = 'no-network' # no_network, calcium
     
     # Get the positions and connections
-    positions = get_positions()
-    connections = get_connections()
+    positions = get_positions(simulation_type)
+    connections = get_connections(simulation_type)
 
     # Plot the points and connections according to settings
     plot(positions=positions,
          connections=connections,
-         area_mapping=False)
+         area_mapping=False,
+         simulation_type=simulation_type)
 
 
 if __name__ == '__main__':